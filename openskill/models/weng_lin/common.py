@@ -2,53 +2,41 @@
 Common functions for the Weng-Lin models.
 """
 
+import math
 import sys
-from itertools import zip_longest
+from functools import lru_cache
 from statistics import NormalDist
 from typing import Any, List, Tuple
 
-from openskill.models.common import _matrix_transpose
-
 _normal = NormalDist()
 
+_SQRT_2 = math.sqrt(2.0)
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+_EPSILON = sys.float_info.epsilon
+
 
-def _unwind(tenet: List[float], objects: List[Any]) -> Tuple[List[Any], List[float]]:
+def _unwind(tenet: List[float], objects: List[Any]) -> Tuple[List[Any], List[int]]:
     """
     Retain the stochastic tenet of a sort to revert original sort order.
 
     :param tenet: A list of tenets for each object in the list.
 
     :param objects: A list of teams to sort.
-    :return: Ordered objects and their tenets.
+    :return: Ordered objects and the original index of each one.
     """
 
-    def _pick_zeroth_index(item: Tuple[float, Any]) -> float:
-        """
-        Returns the first item in a list.
-
-        :param item: A list of objects.
-        :return: The first item in the list.
-        """
-        return item[0]
-
     def _sorter(
         objects_to_sort: List[Any],
-    ) -> Tuple[List[Any], List[float]]:
+    ) -> Tuple[List[Any], List[int]]:
         """
         Sorts a list of objects based on a tenet.
 
         :param objects_to_sort: A list of objects to sort.
-        :return: A tuple of the sorted objects and their tenets.
+        :return: A tuple of the sorted objects and their original indices.
         """
-        matrix = [[tenet[i], [x, i]] for i, x in enumerate(objects_to_sort)]
-        unsorted_matrix = _matrix_transpose(matrix)
-        if unsorted_matrix:
-            zipped_matrix = list(zip(unsorted_matrix[0], unsorted_matrix[1]))
-            zipped_matrix.sort(key=_pick_zeroth_index)
-            sorted_matrix = [x for _, x in zipped_matrix]
-            return [x for x, _ in sorted_matrix], [x for _, x in sorted_matrix]
-        else:
-            return [], []
+        # A stable sort of the indices by tenet, so equal tenets keep their order.
+        indices = sorted(range(len(objects_to_sort)), key=tenet.__getitem__)
+        return [objects_to_sort[i] for i in indices], indices
 
     return _sorter(objects) if isinstance(objects, list) else _sorter
 
@@ -60,7 +48,7 @@ def phi_major(x: float) -> float:
     :param x: A number.
     :return: A number.
     """
-    return _normal.cdf(x)
+    return 0.5 * math.erfc(-x / _SQRT_2)
 
 
 def phi_major_inverse(x: float) -> float:
@@ -80,7 +68,25 @@ def phi_minor(x: float) -> float:
     :param x: A number.
     :return: A number.
     """
-    return _normal.pdf(x)
+    return _INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+
+@lru_cache(maxsize=256)
+def _draw_margin(total_player_count: int, beta: float) -> float:
+    """
+    The margin within which a match between all players is a draw. It only
+    depends on the player count and beta, so it is cached across calls.
+
+    :param total_player_count: The number of players in the match.
+    :param beta: The model's beta.
+    :return: A number.
+    """
+    draw_probability = 1 / total_player_count
+    return (
+        math.sqrt(total_player_count)
+        * beta
+        * phi_major_inverse((1 + draw_probability) / 2)
+    )
 
 
 def v(x: float, t: float) -> float:
@@ -93,9 +99,7 @@ def v(x: float, t: float) -> float:
     """
     xt = x - t
     denominator = phi_major(xt)
-    return (
-        -xt if (denominator < sys.float_info.epsilon) else phi_minor(xt) / denominator
-    )
+    return -xt if (denominator < _EPSILON) else phi_minor(xt) / denominator
 
 
 def w(x: float, t: float) -> float:
@@ -108,9 +112,10 @@ def w(x: float, t: float) -> float:
     """
     xt = x - t
     denominator = phi_major(xt)
-    if denominator < sys.float_info.epsilon:
+    if denominator < _EPSILON:
         return 1 if (x < 0) else 0
-    return v(x, t) * (v(x, t) + xt)
+    v_value = phi_minor(xt) / denominator
+    return v_value * (v_value + xt)
 
 
 def vt(x: float, t: float) -> float:
@@ -141,11 +146,19 @@ def wt(x: float, t: float) -> float:
     """
     xx = abs(x)
     b = phi_major(t - xx) - phi_major(-t - xx)
-    if b < sys.float_info.epsilon:
+    if b < _EPSILON:
         return 1.0
-    return ((t - xx) * phi_minor(t - xx) + (t + xx) * phi_minor(-t - xx)) / b + vt(
-        x, t
-    ) * vt(x, t)
+    upper = phi_minor(t - xx)
+    lower = phi_minor(-t - xx)
+
+    # Same as vt(x, t), but reusing the CDF and PDF values from above.
+    if b < 1e-5:
+        vt_value = -x - t if x < 0 else -x + t
+    else:
+        a = lower - upper
+        vt_value = (-a if x < 0 else a) / b
+
+    return ((t - xx) * upper + (t + xx) * lower) / b + vt_value * vt_value
 
 
 def _ladder_pairs(teams: List[Any]) -> List[List[Any]]:
@@ -155,19 +168,10 @@ def _ladder_pairs(teams: List[Any]) -> List[List[Any]]:
     :param teams: A list of teams.
     :return: A list of pairs of teams that are adjacent in the ladder.
     """
-    left: List[Any] = [None]
-    left.extend(teams[:-1])
-    right: List[Any] = list(teams[1:])
-    right.append(None)
-    zipped_lr = zip_longest(left, right)
-    result = []
-    for _left, _right in zipped_lr:
-        if _left and _right:
-            result.append([_left, _right])
-        elif _left and not _right:
-            result.append([_left])
-        elif not _left and _right:
-            result.append([_right])
-        else:
-            result.append([])
+    if len(teams) < 2:
+        return [[]]
+    result = [[teams[1]]]
+    for index in range(1, len(teams) - 1):
+        result.append([teams[index - 1], teams[index + 1]])
+    result.append([teams[-2]])
     return result
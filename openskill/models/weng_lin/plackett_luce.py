@@ -3,15 +3,14 @@
 Specific classes and functions for the Plackett-Luce model.
 """
 
-import copy
 import itertools
 import math
 import uuid
-from functools import reduce
+from collections import Counter
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
 
-from openskill.models.common import _rank_data, _unary_minus
-from openskill.models.weng_lin.common import _unwind, phi_major, phi_major_inverse
+from openskill.models.common import _rank_data
+from openskill.models.weng_lin.common import _draw_margin, _unwind, phi_major
 
 __all__: List[str] = ["PlackettLuce", "PlackettLuceRating"]
 
@@ -23,6 +22,8 @@ class PlackettLuceRating:
     This object is returned by the :code:`PlackettLuce.rating` method.
     """
 
+    __slots__ = ("_id", "name", "mu", "sigma")
+
     def __init__(
         self,
         mu: float,
@@ -46,12 +47,37 @@ class PlackettLuceRating:
         """
 
         # Player Information
-        self.id: str = uuid.uuid4().hex.lower()
+        self._id: Optional[str] = None
         self.name: Optional[str] = name
 
         self.mu: float = mu
         self.sigma: float = sigma
 
+    @property
+    def id(self) -> str:
+        """
+        Unique identifier of the player. It is only generated the first
+        time it is accessed, so creating ratings in bulk stays cheap.
+
+        :return: A hexadecimal UUID string.
+        """
+        if self._id is None:
+            self._id = uuid.uuid4().hex
+        return self._id
+
+    @id.setter
+    def id(self, value: str) -> None:
+        self._id = value
+
+    def __getstate__(self) -> Tuple[None, Dict[str, Any]]:
+        # Generate the id before pickling so the copy keeps the same one.
+        return None, {
+            "_id": self.id,
+            "name": self.name,
+            "mu": self.mu,
+            "sigma": self.sigma,
+        }
+
     def __repr__(self) -> str:
         return f"PlackettLuceRating(mu={self.mu}, sigma={self.sigma})"
 
@@ -91,10 +117,7 @@ class PlackettLuceRating:
 
     def __lt__(self, other: "PlackettLuceRating") -> bool:
         if isinstance(other, PlackettLuceRating):
-            if self.ordinal() < other.ordinal():
-                return True
-            else:
-                return False
+            return self.mu - 3.0 * self.sigma < other.mu - 3.0 * other.sigma
         else:
             raise ValueError(
                 "You can only compare PlackettLuceRating objects with each other."
@@ -102,10 +125,7 @@ class PlackettLuceRating:
 
     def __gt__(self, other: "PlackettLuceRating") -> bool:
         if isinstance(other, PlackettLuceRating):
-            if self.ordinal() > other.ordinal():
-                return True
-            else:
-                return False
+            return self.mu - 3.0 * self.sigma > other.mu - 3.0 * other.sigma
         else:
             raise ValueError(
                 "You can only compare PlackettLuceRating objects with each other."
@@ -113,10 +133,7 @@ class PlackettLuceRating:
 
     def __le__(self, other: "PlackettLuceRating") -> bool:
         if isinstance(other, PlackettLuceRating):
-            if self.ordinal() <= other.ordinal():
-                return True
-            else:
-                return False
+            return self.mu - 3.0 * self.sigma <= other.mu - 3.0 * other.sigma
         else:
             raise ValueError(
                 "You can only compare PlackettLuceRating objects with each other."
@@ -124,10 +141,7 @@ class PlackettLuceRating:
 
     def __ge__(self, other: "PlackettLuceRating") -> bool:
         if isinstance(other, PlackettLuceRating):
-            if self.ordinal() >= other.ordinal():
-                return True
-            else:
-                return False
+            return self.mu - 3.0 * self.sigma >= other.mu - 3.0 * other.sigma
         else:
             raise ValueError(
                 "You can only compare PlackettLuceRating objects with each other."
@@ -151,6 +165,8 @@ class PlackettLuceTeamRating:
     The collective Plackett-Luce rating of a team.
     """
 
+    __slots__ = ("mu", "sigma_squared", "team", "rank")
+
     def __init__(
         self,
         mu: float,
@@ -414,37 +430,35 @@ class PlackettLuce:
         :param teams: List of lists of PlackettLuceRating objects.
         """
         # Catch teams argument errors
-        if isinstance(teams, list):
-            if len(teams) < 2:
-                raise ValueError(
-                    f"Argument 'teams' must have at least 2 teams, not {len(teams)}."
+        if not isinstance(teams, list):
+            raise TypeError(
+                f"Argument 'teams' must be a list of lists of 'PlackettLuceRating' objects, "
+                f"not '{teams.__class__.__name__}'."
+            )
+
+        if len(teams) < 2:
+            raise ValueError(
+                f"Argument 'teams' must have at least 2 teams, not {len(teams)}."
+            )
+
+        for team in teams:
+            if not isinstance(team, list):
+                raise TypeError(
+                    f"Argument 'teams' must be a list of lists of 'PlackettLuceRating' objects, "
+                    f"not '{team.__class__.__name__}'."
                 )
 
-            for team in teams:
-                if isinstance(team, list):
-                    if len(team) < 1:
-                        raise ValueError(
-                            f"Argument 'teams' must have at least 1 player per team, not {len(team)}."
-                        )
+            if len(team) < 1:
+                raise ValueError(
+                    f"Argument 'teams' must have at least 1 player per team, not {len(team)}."
+                )
 
-                    for player in team:
-                        if isinstance(player, PlackettLuceRating):
-                            pass
-                        else:
-                            raise TypeError(
-                                f"Argument 'teams' must be a list of lists of 'PlackettLuceRating' objects, "
-                                f"not '{player.__class__.__name__}'."
-                            )
-                else:
+            for player in team:
+                if not isinstance(player, PlackettLuceRating):
                     raise TypeError(
                         f"Argument 'teams' must be a list of lists of 'PlackettLuceRating' objects, "
-                        f"not '{team.__class__.__name__}'."
+                        f"not '{player.__class__.__name__}'."
                     )
-        else:
-            raise TypeError(
-                f"Argument 'teams' must be a list of lists of 'PlackettLuceRating' objects, "
-                f"not '{teams.__class__.__name__}'."
-            )
 
     def rate(
         self,
@@ -453,6 +467,8 @@ class PlackettLuce:
         scores: Optional[List[float]] = None,
         tau: Optional[float] = None,
         limit_sigma: Optional[bool] = None,
+        *,
+        _skip_checks: bool = False,
     ) -> List[List[PlackettLuceRating]]:
         """
         Calculate the new ratings based on the given teams and parameters.
@@ -472,11 +488,17 @@ class PlackettLuce:
         :param limit_sigma: Boolean that determines whether to restrict
                             the value of sigma from increasing.
 
+        :param _skip_checks: Private flag for callers that have already
+                             validated the teams, ranks and scores. Skips
+                             :code:`_check_teams` and the per-element rank
+                             and score type checks.
+
         :return: A list of teams where each team is a list of updated
                 :class:`PlackettLuceRating` objects.
         """
         # Catch teams argument errors
-        self._check_teams(teams)
+        if not _skip_checks:
+            self._check_teams(teams)
 
         # Catch ranks argument errors
         if ranks:
@@ -487,14 +509,15 @@ class PlackettLuce:
                         f"not {len(ranks)}."
                     )
 
-                for rank in ranks:
-                    if isinstance(rank, (int, float)):
-                        pass
-                    else:
-                        raise TypeError(
-                            f"Argument 'ranks' must be a list of 'int' or 'float' values, "
-                            f"not '{rank.__class__.__name__}'."
-                        )
+                if not _skip_checks:
+                    for rank in ranks:
+                        if isinstance(rank, (int, float)):
+                            pass
+                        else:
+                            raise TypeError(
+                                f"Argument 'ranks' must be a list of 'int' or 'float' values, "
+                                f"not '{rank.__class__.__name__}'."
+                            )
             else:
                 raise TypeError(
                     f"Argument 'ranks' must be a list of 'int' or 'float' values, "
@@ -516,37 +539,39 @@ class PlackettLuce:
                         f"not {len(scores)}."
                     )
 
-                for score in scores:
-                    if isinstance(score, (int, float)):
-                        pass
-                    else:
-                        raise TypeError(
-                            f"Argument 'scores' must be a list of 'int' or 'float' values, "
-                            f"not '{score.__class__.__name__}'."
-                        )
+                if not _skip_checks:
+                    for score in scores:
+                        if isinstance(score, (int, float)):
+                            pass
+                        else:
+                            raise TypeError(
+                                f"Argument 'scores' must be a list of 'int' or 'float' values, "
+                                f"not '{score.__class__.__name__}'."
+                            )
             else:
                 raise TypeError(
                     f"Argument 'scores' must be a list of 'int' or 'float' values, "
                     f"not '{scores.__class__.__name__}'."
                 )
 
-        # Deep Copy Teams
-        original_teams = copy.deepcopy(teams)
+        if limit_sigma is not None:
+            self.limit_sigma = limit_sigma
+
+        # Keep Original Sigmas
+        original_sigmas = None
+        if self.limit_sigma:
+            original_sigmas = [[player.sigma for player in team] for team in teams]
 
         # Correct Sigma With Tau
         tau = tau if tau else self.tau
         tau_squared = tau * tau
-        for team_index, team in enumerate(teams):
-            for player_index, player in enumerate(team):
-                teams[team_index][player_index].sigma = math.sqrt(
-                    player.sigma * player.sigma + tau_squared
-                )
+        for team in teams:
+            for player in team:
+                player.sigma = math.sqrt(player.sigma * player.sigma + tau_squared)
 
         # Convert Score to Ranks
         if not ranks and scores:
-            ranks = []
-            for score in scores:
-                ranks.append(_unary_minus(score))
+            ranks = [-score for score in scores]
 
         tenet = None
         if ranks:
@@ -554,46 +579,21 @@ class PlackettLuce:
             ordered_teams = rank_teams_unwound[0]
             tenet = rank_teams_unwound[1]
             teams = ordered_teams
-            ranks = sorted(ranks)
+            ranks = [ranks[i] for i in tenet]
+            if original_sigmas is not None:
+                original_sigmas = [original_sigmas[i] for i in tenet]
 
-        processed_result = []
+        # _compute builds a new list for every team, so it is returned as is.
         if ranks and tenet:
-            result = self._compute(teams, ranks)
-            unwound_result = _unwind(tenet, result)[0]
-            for item in unwound_result:
-                team = []
-                for player in item:
-                    team.append(player)
-                processed_result.append(team)
+            result = self._compute(teams, ranks, original_sigmas)
+            # Team i of the result came from position tenet[i], so scattering
+            # through the tenet restores the original order without a sort.
+            processed_result = list(result)
+            for sorted_index, original_index in enumerate(tenet):
+                processed_result[original_index] = result[sorted_index]
         else:
-            result = self._compute(teams)
-            for item in result:
-                team = []
-                for player in item:
-                    team.append(player)
-                processed_result.append(team)
-
-        # Possible Final Result
-        final_result = processed_result
-
-        if limit_sigma is not None:
-            self.limit_sigma = limit_sigma
-
-        if self.limit_sigma:
-            final_result = []
-
-            # Reuse processed_result
-            for team_index, team in enumerate(processed_result):
-                final_team = []
-                for player_index, player in enumerate(team):
-                    player_original = original_teams[team_index][player_index]
-                    if player.sigma <= player_original.sigma:
-                        player.sigma = player.sigma
-                    else:
-                        player.sigma = player_original.sigma
-                    final_team.append(player)
-                final_result.append(final_team)
-        return final_result
+            processed_result = self._compute(teams, sigma_limits=original_sigmas)
+        return processed_result
 
     def _c(self, team_ratings: List[PlackettLuceTeamRating]) -> float:
         r"""
@@ -636,16 +636,23 @@ class PlackettLuce:
         :return: A list of Decimals.
         """
 
-        sum_q: Dict[int, float] = {}
-        for i, team_i in enumerate(team_ratings):
-            summed = math.exp(team_i.mu / c)
-            for q, team_q in enumerate(team_ratings):
-                if team_i.rank >= team_q.rank:
-                    if q in sum_q:
-                        sum_q[q] += summed
-                    else:
-                        sum_q[q] = summed
-        return list(sum_q.values())
+        # Walk the teams from the worst rank to the best while keeping a
+        # running total, so every team picks up the sum of all teams ranked
+        # the same or worse than itself.
+        order = sorted(
+            range(len(team_ratings)),
+            key=lambda i: team_ratings[i].rank,
+            reverse=True,
+        )
+        sum_q = [0.0] * len(team_ratings)
+        summed = 0.0
+        for _, group in itertools.groupby(order, key=lambda i: team_ratings[i].rank):
+            tied = list(group)
+            for q in tied:
+                summed += math.exp(team_ratings[q].mu / c)
+            for q in tied:
+                sum_q[q] = summed
+        return sum_q
 
     @staticmethod
     def _a(team_ratings: List[PlackettLuceTeamRating]) -> List[int]:
@@ -661,18 +668,14 @@ class PlackettLuce:
         :param team_ratings: The whole rating of a list of teams in a game.
         :return: A list of Decimals.
         """
-        result = list(
-            map(
-                lambda i: len(list(filter(lambda q: i.rank == q.rank, team_ratings))),
-                team_ratings,
-            )
-        )
-        return result
+        counts = Counter(team.rank for team in team_ratings)
+        return [counts[team.rank] for team in team_ratings]
 
     def _compute(
         self,
         teams: Sequence[Sequence[PlackettLuceRating]],
         ranks: Optional[List[float]] = None,
+        sigma_limits: Optional[List[List[float]]] = None,
     ) -> List[List[PlackettLuceRating]]:
         # Initialize Constants
         original_teams = teams
@@ -680,45 +683,57 @@ class PlackettLuce:
         c = self._c(team_ratings)
         sum_q = self._sum_q(team_ratings, c)
         a = self._a(team_ratings)
+        c_squared = c * c
+        kappa = self.kappa
+        gamma = self.gamma
+        k = len(team_ratings)
+
+        # The inner loop only needs the rank, sum and count of each team, so
+        # gather them once into a list of tuples instead of per pair.
+        team_q_values = list(zip([team.rank for team in team_ratings], sum_q, a))
 
         result = []
         for i, team_i in enumerate(team_ratings):
             omega = 0.0
             delta = 0.0
             i_mu_over_c = math.exp(team_i.mu / c)
+            i_rank = team_i.rank
 
-            for q, team_q in enumerate(team_ratings):
-                i_mu_over_ce_over_sum_q = i_mu_over_c / sum_q[q]
-                if team_q.rank <= team_i.rank:
+            for q, (q_rank, q_sum, q_a) in enumerate(team_q_values):
+                if q_rank <= i_rank:
+                    i_mu_over_ce_over_sum_q = i_mu_over_c / q_sum
                     delta += (
-                        i_mu_over_ce_over_sum_q * (1 - i_mu_over_ce_over_sum_q) / a[q]
+                        i_mu_over_ce_over_sum_q * (1 - i_mu_over_ce_over_sum_q) / q_a
                     )
                     if q == i:
-                        omega += (1 - i_mu_over_ce_over_sum_q) / a[q]
+                        omega += (1 - i_mu_over_ce_over_sum_q) / q_a
                     else:
-                        omega -= i_mu_over_ce_over_sum_q / a[q]
-
-            omega *= team_i.sigma_squared / c
-            delta *= team_i.sigma_squared / c**2
+                        omega -= i_mu_over_ce_over_sum_q / q_a
 
-            gamma_value = self.gamma(
+            gamma_value = gamma(
                 c,
-                len(team_ratings),
+                k,
                 team_i.mu,
                 team_i.sigma_squared,
                 team_i.team,
                 team_i.rank,
             )
-            delta *= gamma_value
+
+            omega_scale = omega / c
+            delta_scale = delta * gamma_value / c_squared
+
+            # Sigma is capped at its value before the update when limiting.
+            team_limits = sigma_limits[i] if sigma_limits is not None else None
 
             intermediate_result_per_team = []
             for j, j_players in enumerate(team_i.team):
                 mu = j_players.mu
                 sigma = j_players.sigma
-                mu += (sigma**2 / team_i.sigma_squared) * omega
-                sigma *= math.sqrt(
-                    max(1 - (sigma**2 / team_i.sigma_squared) * delta, self.kappa),
-                )
+                sigma_squared = sigma * sigma
+                mu += sigma_squared * omega_scale
+                sigma *= math.sqrt(max(1 - sigma_squared * delta_scale, kappa))
+                if team_limits is not None and sigma > team_limits[j]:
+                    sigma = team_limits[j]
                 modified_player = original_teams[i][j]
                 modified_player.mu = mu
                 modified_player.sigma = sigma
@@ -760,26 +775,28 @@ class PlackettLuce:
             )
             return [result, 1 - result]
 
-        pairwise_probabilities = []
-        for pair_a, pair_b in itertools.permutations(teams, 2):
-            pair_a_subset = self._calculate_team_ratings([pair_a])
-            pair_b_subset = self._calculate_team_ratings([pair_b])
-            mu_a = pair_a_subset[0].mu
-            sigma_a = pair_a_subset[0].sigma_squared
-            mu_b = pair_b_subset[0].mu
-            sigma_b = pair_b_subset[0].sigma_squared
-            pairwise_probabilities.append(
-                phi_major(
-                    (mu_a - mu_b) / math.sqrt(n * self.beta**2 + sigma_a + sigma_b)
-                )
+        # Each pair is evaluated once since phi_major(-x) is 1 - phi_major(x).
+        # The CDF is always taken at the negative side, where it stays accurate
+        # for very unlikely outcomes, and the other team gets its complement.
+        teams_ratings = self._calculate_team_ratings(teams)
+        n_beta_squared = n * self.beta**2
+        win_probabilities = [0.0] * n
+        for i, j in itertools.combinations(range(n), 2):
+            a = teams_ratings[i]
+            b = teams_ratings[j]
+            x = (a.mu - b.mu) / math.sqrt(
+                n_beta_squared + a.sigma_squared + b.sigma_squared
             )
+            if x > 0:
+                p_ji = phi_major(-x)
+                p_ij = 1 - p_ji
+            else:
+                p_ij = phi_major(x)
+                p_ji = 1 - p_ij
+            win_probabilities[i] += p_ij
+            win_probabilities[j] += p_ji
 
-        return [
-            (sum(team_prob) / denominator)
-            for team_prob in itertools.zip_longest(
-                *[iter(pairwise_probabilities)] * (n - 1)
-            )
-        ]
+        return [probability / denominator for probability in win_probabilities]
 
     def predict_draw(self, teams: List[List[PlackettLuceRating]]) -> float:
         r"""
@@ -795,37 +812,29 @@ class PlackettLuce:
 
         n = len(teams)
         total_player_count = sum([len(_) for _ in teams])
-        draw_probability = 1 / total_player_count
-        draw_margin = (
-            math.sqrt(total_player_count)
-            * self.beta
-            * phi_major_inverse((1 + draw_probability) / 2)
-        )
-
-        pairwise_probabilities = []
-        for pair_a, pair_b in itertools.permutations(teams, 2):
-            pair_a_subset = self._calculate_team_ratings([pair_a])
-            pair_b_subset = self._calculate_team_ratings([pair_b])
-            mu_a = pair_a_subset[0].mu
-            sigma_a = pair_a_subset[0].sigma_squared
-            mu_b = pair_b_subset[0].mu
-            sigma_b = pair_b_subset[0].sigma_squared
-            pairwise_probabilities.append(
-                phi_major(
-                    (draw_margin - mu_a + mu_b)
-                    / math.sqrt(n * self.beta**2 + sigma_a + sigma_b)
-                )
-                - phi_major(
-                    (mu_a - mu_b - draw_margin)
-                    / math.sqrt(n * self.beta**2 + sigma_a + sigma_b)
-                )
+        draw_margin = _draw_margin(total_player_count, self.beta)
+
+        # Both orderings of a pair share the same spread, and since
+        # phi_major(x) - phi_major(-x) is 2 * phi_major(x) - 1, the pair
+        # needs one CDF per ordering instead of two.
+        teams_ratings = self._calculate_team_ratings(teams)
+        n_beta_squared = n * self.beta**2
+        draw_probability_sum = 0.0
+        for a, b in itertools.combinations(teams_ratings, 2):
+            mu_difference = a.mu - b.mu
+            c = math.sqrt(n_beta_squared + a.sigma_squared + b.sigma_squared)
+            draw_probability_sum += (
+                2 * phi_major((draw_margin - mu_difference) / c)
+                - 1
+                + 2 * phi_major((draw_margin + mu_difference) / c)
+                - 1
             )
 
         denominator = 1
         if n > 2:
             denominator = n * (n - 1)
 
-        return abs(sum(pairwise_probabilities)) / denominator
+        return abs(draw_probability_sum) / denominator
 
     def predict_rank(
         self, teams: List[List[PlackettLuceRating]]
@@ -843,35 +852,37 @@ class PlackettLuce:
         n = len(teams)
         total_player_count = sum([len(_) for _ in teams])
         denom = (n * (n - 1)) / 2
-        draw_probability = 1 / total_player_count
-        draw_margin = (
-            math.sqrt(total_player_count)
-            * self.beta
-            * phi_major_inverse((1 + draw_probability) / 2)
-        )
+        draw_margin = _draw_margin(total_player_count, self.beta)
 
-        pairwise_probabilities = []
-        for pair_a, pair_b in itertools.permutations(teams, 2):
-            pair_a_subset = self._calculate_team_ratings([pair_a])
-            pair_b_subset = self._calculate_team_ratings([pair_b])
-            mu_a = pair_a_subset[0].mu
-            sigma_a = pair_a_subset[0].sigma_squared
-            mu_b = pair_b_subset[0].mu
-            sigma_b = pair_b_subset[0].sigma_squared
-            pairwise_probabilities.append(
-                phi_major(
-                    (mu_a - mu_b - draw_margin)
-                    / math.sqrt(n * self.beta**2 + sigma_a + sigma_b)
-                )
-            )
-        win_probability = [
-            (sum(team_prob) / denom)
-            for team_prob in itertools.zip_longest(
-                *[iter(pairwise_probabilities)] * (n - 1)
-            )
-        ]
+        teams_ratings = self._calculate_team_ratings(teams)
+        n_beta_squared = n * self.beta**2
 
-        ranked_probability = [abs(_) for _ in win_probability]
+        # 2 Team Case
+        if n == 2:
+            a = teams_ratings[0]
+            b = teams_ratings[1]
+            mu_difference = a.mu - b.mu
+            c = math.sqrt(n_beta_squared + a.sigma_squared + b.sigma_squared)
+            a_probability = phi_major((mu_difference - draw_margin) / c)
+            b_probability = phi_major((-mu_difference - draw_margin) / c)
+            return [
+                (1 if a_probability >= b_probability else 2, a_probability),
+                (1 if b_probability >= a_probability else 2, b_probability),
+            ]
+
+        # Both orderings of a pair share the same spread, so each unordered
+        # pair is visited once and credits both teams.
+        win_probability = [0.0] * n
+        for i, j in itertools.combinations(range(n), 2):
+            a = teams_ratings[i]
+            b = teams_ratings[j]
+            mu_difference = a.mu - b.mu
+            c = math.sqrt(n_beta_squared + a.sigma_squared + b.sigma_squared)
+            win_probability[i] += phi_major((mu_difference - draw_margin) / c)
+            win_probability[j] += phi_major((-mu_difference - draw_margin) / c)
+
+        # The totals are sums of CDF values, so they are never negative.
+        ranked_probability = [probability / denom for probability in win_probability]
         ranks = list(_rank_data(ranked_probability))
         max_ordinal = max(ranks)
         ranks = [abs(_ - max_ordinal) + 1 for _ in ranks]
@@ -900,8 +911,11 @@ class PlackettLuce:
 
         result = []
         for index, team in enumerate(game):
-            mu_summed = reduce(lambda x, y: x + y, map(lambda p: p.mu, team))
-            sigma_squared = reduce(lambda x, y: x + y, map(lambda p: p.sigma**2, team))
+            mu_summed = 0.0
+            sigma_squared = 0.0
+            for player in team:
+                mu_summed += player.mu
+                sigma_squared += player.sigma * player.sigma
             result.append(
                 PlackettLuceTeamRating(mu_summed, sigma_squared, team, rank[index])
             )
@@ -925,21 +939,22 @@ class PlackettLuce:
 
         :return: A list of ranks for each team in the game.
         """
-        if ranks:
-            team_scores = []
-            for index, _ in enumerate(game):
-                if isinstance(ranks[index], int):
-                    team_scores.append(ranks[index])
-                else:
-                    team_scores.append(index)
-        else:
-            team_scores = [i for i, _ in enumerate(game)]
+        # Without ranks every team keeps its own position.
+        if not ranks:
+            return list(range(len(game)))
+
+        team_scores = []
+        for index, _ in enumerate(game):
+            if isinstance(ranks[index], (int, float)):
+                team_scores.append(ranks[index])
+            else:
+                team_scores.append(index)
 
-        rank_output = {}
+        rank_output = [0] * len(team_scores)
         s = 0
         for index, value in enumerate(team_scores):
             if index > 0:
                 if team_scores[index - 1] < team_scores[index]:
                     s = index
             rank_output[index] = s
-        return list(rank_output.values())
+        return rank_output
@@ -268,6 +268,14 @@ def test_sum_q() -> None:
     assert sum_q[0] == pytest.approx(204.84, 0.0001)
     assert sum_q[1] == pytest.approx(102.42, 0.0001)
 
+    # Tied teams share the same sum
+    ratings = model._calculate_team_ratings([team_1, team_2, [r()]], ranks=[1, 1, 2])
+    c = model._c(ratings)
+    sum_q = model._sum_q(ratings, c)
+    assert sum_q[0] == pytest.approx(23.611437, 0.0001)
+    assert sum_q[1] == pytest.approx(23.611437, 0.0001)
+    assert sum_q[2] == pytest.approx(3.960991, 0.0001)
+
 
 def test_gamma() -> None:
     """
@@ -282,6 +290,20 @@ def test_gamma() -> None:
     assert _gamma(2, 2, 3, 64, team, 1) == pytest.approx(4)
 
 
+def test_custom_gamma() -> None:
+    """
+    Ensure a custom gamma function is used instead of the default one.
+    """
+    model = BradleyTerryPart(gamma=lambda c, k, mu, s, team, rank: 0, tau=0)
+    r = model.rating
+    a = r()
+    b = r()
+    [[winner], [loser]] = model.rate([[a], [b]])
+    assert winner.sigma == pytest.approx(25.0 / 3.0)
+    assert loser.sigma == pytest.approx(25.0 / 3.0)
+    assert winner.mu > loser.mu
+
+
 def check_expected(
     data, data_key: str, results: List[List[BradleyTerryPartRating]]
 ) -> None:
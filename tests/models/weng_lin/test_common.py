@@ -2,13 +2,49 @@
 All tests common for Weng-Lin models are located here.
 """
 
+import copy
+import itertools
+import math
+import pickle
 import random
 from typing import Any, List
 
 import pytest
 
 from openskill.models import MODELS
-from openskill.models.weng_lin.common import _ladder_pairs, _unwind, v, vt, w, wt
+from openskill.models.weng_lin.common import (
+    _draw_margin,
+    _ladder_pairs,
+    _unwind,
+    phi_major,
+    v,
+    vt,
+    w,
+    wt,
+)
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_rating_id(model) -> None:
+    """
+    Tests that rating IDs are unique, stable and can be overridden.
+    """
+    model = model()
+    rating_1 = model.rating()
+    rating_2 = model.rating()
+
+    assert rating_1.id == rating_1.id
+    assert rating_1.id != rating_2.id
+    assert len(rating_1.id) == 32
+    assert copy.deepcopy(rating_1).id == rating_1.id
+
+    rating_3 = model.rating(mu=30, name="pickled")
+    rating_4 = pickle.loads(pickle.dumps(rating_3))
+    assert rating_4.id == rating_3.id
+    assert (rating_4.name, rating_4.mu, rating_4.sigma) == ("pickled", 30, 25 / 3)
+
+    rating_1.id = "custom"
+    assert rating_1.id == "custom"
 
 
 @pytest.mark.parametrize("model", MODELS)
@@ -95,6 +131,101 @@ def test_calculate_rankings(model) -> None:
         4,
     ]
 
+    # Float ranks tie the same way as integer ranks
+    assert model._calculate_rankings([a, b, c], [1.5, 1.5, 2.0]) == [0, 0, 2]
+    assert model._calculate_rankings([a, b, c], [-3.0, -1.0, -1.0]) == [0, 1, 1]
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_rate_skip_checks(model) -> None:
+    """
+    Checks that skipping validation keeps the results and the length checks.
+    """
+    model = model()
+    r = model.rating
+
+    teams = [[r(), r()], [r()], [r()]]
+    checked = model.rate(teams, ranks=[2, 1, 3])
+    skipped = model.rate(teams, ranks=[2, 1, 3], _skip_checks=True)
+    assert [[(p.mu, p.sigma) for p in team] for team in checked] == [
+        [(p.mu, p.sigma) for p in team] for team in skipped
+    ]
+
+    with pytest.raises(ValueError):
+        model.rate([[r()], [r()]], ranks=[1, 2, 3], _skip_checks=True)
+
+    with pytest.raises(ValueError):
+        model.rate([[r()], [r()]], scores=[1, 2, 3], _skip_checks=True)
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_rate_float_ties(model) -> None:
+    """
+    Tests that tied float scores and ranks rate as a draw.
+    """
+    model = model()
+    r = model.rating
+
+    def rate(mus, **kwargs):
+        teams = model.rate([[r(mu=mu)] for mu in mus], **kwargs)
+        return [[(p.mu, p.sigma) for p in team] for team in teams]
+
+    # Tied float scores are a draw, not a win for the first team
+    assert rate([25, 27], scores=[1.5, 1.5]) == rate([25, 27], ranks=[1, 1])
+    assert rate([25, 27], scores=[1.5, 1.5]) != rate([25, 27], ranks=[1, 2])
+
+    # Tied float ranks are a draw as well
+    assert rate([25, 27, 25], ranks=[1.5, 1.5, 3.0]) == rate(
+        [25, 27, 25], ranks=[1, 1, 3]
+    )
+    assert rate([25, 27, 25], scores=[1.5, 1.5, 0.5]) == rate(
+        [25, 27, 25], ranks=[1, 1, 3]
+    )
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_rating_slots(model) -> None:
+    """
+    Tests that rating objects only accept their declared attributes.
+    """
+    model = model()
+    rating = model.rating()
+    team_rating = model._calculate_team_ratings([[rating]])[0]
+
+    assert not hasattr(rating, "__dict__")
+    with pytest.raises(AttributeError):
+        rating.extra = 1
+    with pytest.raises(AttributeError):
+        team_rating.extra = 1
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_predict_rank_two_teams(model) -> None:
+    """
+    Tests that two team rank predictions match the general formula.
+    """
+    model = model()
+    r = model.rating
+
+    cases = [
+        ([[r(mu=30, sigma=6), r(mu=28)], [r(mu=20), r(mu=22, sigma=7)]], [1, 2]),
+        ([[r(mu=20), r(mu=22, sigma=7)], [r(mu=30, sigma=6), r(mu=28)]], [2, 1]),
+        ([[r(), r()], [r(), r()]], [1, 1]),
+    ]
+    for teams, ranks in cases:
+        team_ratings = model._calculate_team_ratings(teams)
+        draw_margin = _draw_margin(4, model.beta)
+        probabilities = []
+        for a, b in itertools.permutations(team_ratings, 2):
+            c = math.sqrt(2 * model.beta**2 + a.sigma_squared + b.sigma_squared)
+            probabilities.append(phi_major((a.mu - b.mu - draw_margin) / c))
+
+        predictions = model.predict_rank(teams)
+        assert [rank for rank, _ in predictions] == ranks
+        assert [probability for _, probability in predictions] == pytest.approx(
+            probabilities
+        )
+
 
 def test_unwind() -> None:
     """
@@ -151,6 +282,26 @@ def test_unwind() -> None:
     assert output == ["d", "a", "c", "b", "f", "e"]
 
 
+def test_draw_margin() -> None:
+    """
+    Test the draw_margin function
+    """
+    assert _draw_margin(2, 25 / 6) == pytest.approx(3.9744689683705827, 0.00001)
+    assert _draw_margin(4, 25 / 6) == pytest.approx(2.6553280330364597, 0.00001)
+    assert _draw_margin(4, 25 / 6) is _draw_margin(4, 25 / 6)
+
+
+def test_phi_major() -> None:
+    """
+    Test the phi_major function
+    """
+    assert phi_major(0) == 0.5
+    assert phi_major(40) == 1.0
+    # The lower tail stays accurate instead of rounding to zero
+    assert phi_major(-10) == pytest.approx(7.619853024160526e-24, 0.00001)
+    assert phi_major(-20) == pytest.approx(2.753624118606236e-89, 0.00001)
+
+
 def test_v() -> None:
     """
     Test the v function
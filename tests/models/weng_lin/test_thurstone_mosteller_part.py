@@ -290,6 +290,53 @@ def test_gamma() -> None:
     assert _gamma(2, 2, 3, 64, team, 1) == pytest.approx(4)
 
 
+def test_custom_gamma() -> None:
+    """
+    Ensure a custom gamma function is used instead of the default one.
+    """
+    model = ThurstoneMostellerPart(gamma=lambda c, k, mu, s, team, rank: 0, tau=0)
+    r = model.rating
+    a = r()
+    b = r()
+    [[winner], [loser]] = model.rate([[a], [b]])
+    assert winner.sigma == pytest.approx(25.0 / 3.0)
+    assert loser.sigma == pytest.approx(25.0 / 3.0)
+    assert winner.mu > loser.mu
+
+
+def test_compute_pair_matches_ladder() -> None:
+    """
+    Ensure the two team specialization matches the ladder update.
+    """
+    model = ThurstoneMostellerPart(
+        gamma=lambda c, k, mu, sigma_squared, team, rank: sigma_squared / (c * k)
+    )
+    r = model.rating
+    two_beta_squared = 2 * model.beta**2
+
+    # A win and a draw, since teams reach _compute sorted by rank.
+    for ranks in ([0, 1], [0, 0]):
+        # The limits sit below the updated sigmas, so the cap applies.
+        for sigma_limits in (None, [[5.0, 4.0], [5.5]]):
+            results = []
+            for compute in (model._compute_pair, model._compute_ladder):
+                teams = [[r(mu=27, sigma=8), r(mu=21, sigma=6)], [r(sigma=7)]]
+                team_ratings = [
+                    ThurstoneMostellerPartTeamRating(
+                        sum(p.mu for p in team),
+                        sum(p.sigma**2 for p in team),
+                        team,
+                        rank,
+                    )
+                    for team, rank in zip(teams, ranks)
+                ]
+                result = compute(team_ratings, two_beta_squared, False, sigma_limits)
+                results.append([[(p.mu, p.sigma) for p in team] for team in result])
+            assert results[0] == results[1]
+            if sigma_limits is not None:
+                assert [[p[1] for p in team] for team in results[0]] == sigma_limits
+
+
 def check_expected(
     data, data_key: str, results: List[List[ThurstoneMostellerPartRating]]
 ) -> None: